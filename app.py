@@ -1,19 +1,33 @@
 from __future__ import annotations
 import io
+import os
+import atexit
+import multiprocessing
 import re
+import threading
+import time
 import datetime as dt
+from concurrent.futures import ProcessPoolExecutor
+from typing import BinaryIO
 from zoneinfo import ZoneInfo
 
 import requests
-from bs4 import BeautifulSoup
+import requests_cache
+from bs4 import BeautifulSoup, SoupStrainer
 import pdfplumber
+import pypdfium2 as pdfium
 import pandas as pd
-from flask import Flask, jsonify, send_file, Response, render_template_string
+import orjson
+from flask import Flask, jsonify, send_file, Response
+from flask.json.provider import DefaultJSONProvider
 
 # --------- Einstellungen ---------
 TZ = ZoneInfo("Europe/Zurich")
 BASE_URL = "https://www.restaurant-unisg.ch/"
 
+# HTTP-Cache (SQLite) für Startseite & PDF – respektiert Cache-Control/ETag des Servers
+_session = requests_cache.CachedSession("http_cache.sqlite", expire_after=3600, cache_control=True)
+
 # Wochentage (DE)
 WEEKDAY_ORDER = ["montag", "dienstag", "mittwoch", "donnerstag", "freitag"]
 WEEKDAY_PATTERNS = {
@@ -24,8 +38,61 @@ WEEKDAY_PATTERNS = {
     "donnerstag": re.compile(r"\bd\s*o\s*n\s*n\s*e\s*r\s*s\s*t\s*a\s*g\b", re.IGNORECASE),
     "freitag": re.compile(r"\bf\s*r\s*e\s*i\s*t\s*a\s*g\b", re.IGNORECASE),
 }
+# großzügig: Wortgrenzen raus (Fallback, falls str.find den Wochentag nicht findet)
+_DAY_RE_LOOSE = {wd: re.compile(p.pattern.replace("\\b", ""), re.IGNORECASE)
+                 for wd, p in WEEKDAY_PATTERNS.items()}
+
+# Vorkompilierte Muster für das Parsing
+_MULTI_SPACE_RE = re.compile(r"\s{2,}")
+# mind. 3 einzelne Buchstaben, getrennt durch je ein Leerzeichen ("M O N T A G");
+# Whitespace muss vorher kollabiert sein (siehe _normalize_line)
+_SPACED_RUN_RE = re.compile(r"\b(?:[A-Za-zÄÖÜäöü]\s){2,}[A-Za-zÄÖÜäöü]\b")
+_ALLERG_RE = re.compile(r"\b([A-ZÄÖÜ](?:\s*,\s*[A-ZÄÖÜ])+)\b")
+_ALLERG_TAIL_RE = re.compile(r"\b(Allerg(?:ene|ien)|Icon|Info|Bio)\b.*?$", re.IGNORECASE)
+_CAMEL_SPLIT_RE = re.compile(r"([a-zäöü])([A-ZÄÖÜ])")
+# Split am festen Anker "CHF <preis>" – kein Backtracking über den Titel.
+# Zusatzpreise ("CHF 8.50 / 9.50") gehören zum Anker und starten keinen neuen Titel.
+_CHF_SPLIT_RE = re.compile(
+    r"\s*CHF\s*(\d{1,2}[.,]\d{2})(?:\s*/\s*(?:CHF\s*)?\d{1,2}[.,]\d{2})*",
+    re.IGNORECASE,
+)
+
+class ORJSONProvider(DefaultJSONProvider):
+    """
+    JSON über orjson statt des reinen Python-Encoders.
+    Verhält sich wie Flasks Default-Provider: Keys sortiert, default() für date/Decimal/UUID,
+    Pretty-Print im Debug-Modus. separators/ensure_ascii (von Flask selbst übergeben, z. B.
+    für die Session) werden ignoriert – orjson schreibt immer kompaktes UTF-8.
+    """
+    _IGNORED_KWARGS = {"separators", "ensure_ascii"}
+
+    def _dumps_bytes(self, obj, sort_keys: bool | None = None, indent: int | None = None,
+                     default=None) -> bytes:
+        option = orjson.OPT_SORT_KEYS if (self.sort_keys if sort_keys is None else sort_keys) else 0
+        if indent:
+            option |= orjson.OPT_INDENT_2  # orjson kennt nur 2er-Einrückung
+        return orjson.dumps(obj, default=default or self.default, option=option)
+
+    def dumps(self, obj, *, sort_keys: bool | None = None, indent: int | None = None,
+              default=None, **kwargs) -> str:
+        unsupported = kwargs.keys() - self._IGNORED_KWARGS
+        if unsupported:
+            raise TypeError(f"Von orjson nicht unterstützt: {', '.join(sorted(unsupported))}")
+        return self._dumps_bytes(obj, sort_keys, indent, default).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs) -> Response:
+        # Wie DefaultJSONProvider.response (inkl. Flasks internem _prepare_response_obj und
+        # Pretty-Print im Debug-Modus), aber orjson-Bytes direkt – ohne decode/encode-Umweg
+        obj = self._prepare_response_obj(args, kwargs)
+        pretty = self.compact is False or (self.compact is None and self._app.debug)
+        body = self._dumps_bytes(obj, indent=2 if pretty else None)
+        return self._app.response_class(body + b"\n", mimetype=self.mimetype)
 
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
 
 # --------- Helpers Zeit/Daten ---------
 def today_local_date() -> dt.date:
@@ -51,12 +118,26 @@ def _squash_spaced_letters(s: str) -> str:
     """
     PDFs haben oft Buchstaben mit Zwischenräumen (z. B. 'M O N T A G').
     Diese Funktion fügt solche Sequenzen korrekt zusammen.
+    Achtung: trifft jede Folge von mind. 3 Einzelbuchstaben, also auch
+    'Menü A B C' -> 'Menü ABC'.
     """
-    def fix_word(word: str) -> str:
-        if re.fullmatch(r"(?:[A-Za-zÄÖÜäöü]\s*){3,}", word):
-            return re.sub(r"\s+", "", word)
-        return word
-    return " ".join(fix_word(w) for w in s.split())
+    return _SPACED_RUN_RE.sub(lambda m: "".join(m.group(0).split()), s)
+
+def _find_weekday(text_low: str, wd: str) -> int:
+    """
+    Position des ersten Wochentags im (kleingeschriebenen) Text, sonst -1.
+    Schneller Weg über str.find; Teil-Sperrungen wie 'M ONTAG' fängt die lockere Regex.
+    """
+    pos = text_low.find(wd)
+    if pos == -1:
+        m = _DAY_RE_LOOSE[wd].search(text_low)
+        if m:
+            pos = m.start()
+    return pos
+
+def _normalize_line(ln: str) -> str:
+    # erst Whitespace kollabieren, dann squashen – sonst bleibt "M  O  N  T  A  G" stehen
+    return _squash_spaced_letters(" ".join(ln.split()))
 
 def _extract_items_from_lines(lines: list[str], max_items: int | None = 4) -> list[dict]:
     """
@@ -65,27 +146,25 @@ def _extract_items_from_lines(lines: list[str], max_items: int | None = 4) -> li
     Bricht früh ab, sobald max_items erreicht sind.
     """
     text = " ".join(lines)
-    text = re.sub(r"\s+", " ", text).strip()
+    text = " ".join(text.split())  # Whitespace kollabieren ohne Regex
 
     # Allergencodes & Deko entfernen
-    text = re.sub(r"\b([A-ZÄÖÜ](?:\s*,\s*[A-ZÄÖÜ])+)\b", "", text)
-    text = re.sub(r"\b(Allerg(?:ene|ien)|Icon|Info|Bio)\b.*?$", "", text, flags=re.IGNORECASE)
+    text = _ALLERG_RE.sub("", text)
+    text = _ALLERG_TAIL_RE.sub("", text)
 
     items: list[dict] = []
 
-    pattern = re.compile(
-        r"(?P<title>.+?)\s*CHF\s*(?P<price>\d{1,2}[.,]\d{2})(?=\s*(?:[A-ZÄÖÜ]|$)|\s*CHF)",
-        re.IGNORECASE,
-    )
-
-    for m in pattern.finditer(text):
-        title = m.group("title").strip(" ,;:-")
-        price = m.group("price").replace(",", ".")
+    # Nach dem Split: gerade Indizes = Titel, ungerade = Preise (Rest ohne Preis fällt weg)
+    # Ohne "CHF" liefert split() nur [text] – die Schleife läuft dann gar nicht
+    parts = _CHF_SPLIT_RE.split(text)
+    for raw_title, price in zip(parts[0::2], parts[1::2]):
+        title = raw_title.strip(" ,;:-")
+        price = price.replace(",", ".")
         # kosmetische Fixes
         title = title.replace("Tagessuppeklein", "Tagessuppe klein")
         title = title.replace("Tagessuppegross", "Tagessuppe gross")
-        title = re.sub(r"([a-zäöü])([A-ZÄÖÜ])", r"\1 \2", title)
-        title = re.sub(r"\s{2,}", " ", title)
+        title = _CAMEL_SPLIT_RE.sub(r"\1 \2", title)
+        title = _MULTI_SPACE_RE.sub(" ", title)
 
         if title:
             items.append({"title": title, "price_chf": price})
@@ -95,7 +174,7 @@ def _extract_items_from_lines(lines: list[str], max_items: int | None = 4) -> li
     # Falls keine Preise gefunden: jede Zeile als Item
     if not items:
         for ln in lines:
-            t = re.sub(r"\s+", " ", ln).strip(" ,;")
+            t = " ".join(ln.split()).strip(" ,;")
             if t:
                 items.append({"title": t, "price_chf": None})
                 if max_items and len(items) >= max_items:
@@ -114,91 +193,168 @@ def set_cached_pdf_url(url: str) -> None:
     global _cached_pdf_url
     _cached_pdf_url = url
 
-def fetch_current_week_pdf_url() -> str:
+_LINKS_ONLY = SoupStrainer("a", href=True)
+
+def fetch_current_week_pdf_url(refresh: bool = False) -> str:
     """
     Sucht auf der Startseite einen Link 'Aktuelle Woche ... (pdf)'.
     Fällt zurück auf irgendeinen 'menueplan*.pdf', falls nötig.
+    refresh=True umgeht den HTTP-Cache (Revalidierung beim Server).
     """
     headers = {"User-Agent": "Mozilla/5.0 (MenuBot/1.0)"}
-    r = requests.get(BASE_URL, headers=headers, timeout=20)
+    r = _session.get(BASE_URL, headers=headers, timeout=20, refresh=refresh)
     r.raise_for_status()
-    soup = BeautifulSoup(r.text, "html.parser")
+    # nur Links parsen (lxml + SoupStrainer) – der Rest der Seite interessiert nicht
+    soup = BeautifulSoup(r.text, "lxml", parse_only=_LINKS_ONLY)
 
-    # bevorzugt: „Aktuelle Woche“ + .pdf
-    for a in soup.find_all("a", href=True):
-        text = (a.get_text(" ") or "").strip().lower()
+    # bevorzugt: „Aktuelle Woche“ + .pdf; fallback: menueplan*.pdf (erster Treffer)
+    fallback = None
+    for a in soup.find_all("a"):
         href = a["href"]
-        if "aktuelle woche" in text and href.lower().endswith(".pdf"):
+        href_low = href.lower()
+        if not href_low.endswith(".pdf"):
+            continue
+        text = (a.get_text(" ") or "").strip().lower()
+        if "aktuelle woche" in text:
             return href if href.startswith("http") else requests.compat.urljoin(BASE_URL, href)
+        if fallback is None and ("menueplan" in href_low or "menueplaene" in href_low):
+            fallback = href
 
-    # fallback: menueplan*.pdf
-    for a in soup.find_all("a", href=True):
-        href = a["href"]
-        if href.lower().endswith(".pdf") and ("menueplan" in href.lower() or "menueplaene" in href.lower()):
-            return href if href.startswith("http") else requests.compat.urljoin(BASE_URL, href)
+    if fallback is not None:
+        return fallback if fallback.startswith("http") else requests.compat.urljoin(BASE_URL, fallback)
 
     raise RuntimeError("Kein Wochen-Menü-PDF gefunden.")
 
-def load_week_pdf_bytes() -> bytes:
-    url = fetch_current_week_pdf_url()
+def load_week_pdf(refresh: bool = False) -> bytes:
+    """
+    Lädt das Wochen-PDF. Kein stream=True: requests-cache hält den Body ohnehin komplett
+    im Speicher; r.content geht ohne weitere Kopie direkt an PDFium.
+    refresh=True revalidiert Startseite und PDF, statt dem HTTP-Cache zu vertrauen.
+    """
+    url = fetch_current_week_pdf_url(refresh=refresh)
     set_cached_pdf_url(url)
     headers = {"User-Agent": "Mozilla/5.0 (MenuBot/1.0)"}
-    r = requests.get(url, headers=headers, timeout=30)
+    r = _session.get(url, headers=headers, timeout=30, refresh=refresh)
     r.raise_for_status()
     return r.content
 
 # --------- Parsing der Woche ---------
-def parse_week_pdf(pdf_bytes: bytes) -> dict[str, list[dict]]:
+# Wochen-PDFs haben 2–4 Seiten; mehr Worker bringen nichts.
+# "forkserver" statt fork: sicher aus multi-threaded Workern (z. B. gunicorn gthread);
+# wo es kein forkserver gibt (Windows), "spawn".
+# Beim Import angelegt (Prozesse starten erst beim ersten Auftrag), nicht im Request unter _CACHE_LOCK.
+_POOL_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+_PAGE_POOL = ProcessPoolExecutor(
+    max_workers=min(os.cpu_count() or 1, 4),
+    mp_context=multiprocessing.get_context(_POOL_START_METHOD),
+)
+atexit.register(_PAGE_POOL.shutdown)
+
+def _split_text_lines(raw: str) -> list[str]:
+    return [ln for ln in (line.strip() for line in raw.splitlines()) if ln]
+
+def _extract_lines_pdfium(pdf: bytes | BinaryIO) -> tuple[list[str], int]:
     """
-    Gibt je Wochentag eine Liste von Gerichten zurück:
-      {'montag': [{'title': '...', 'price_chf': '...'}, ...], ...}
+    Schnelle Textextraktion mit PDFium (C++), ohne Layout-Objekte wie bei pdfplumber.
+    Gibt die Zeilen und die Seitenzahl zurück.
     """
-    results = {wd: [] for wd in WEEKDAY_ORDER}
-
-    # 1) Alles an Textzeilen einsammeln
-    text_lines: list[str] = []
-    with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
-        for page in pdf.pages:
-            # Tabellen (falls vorhanden)
+    lines: list[str] = []
+    doc = pdfium.PdfDocument(pdf)  # Bytes oder Datei-Objekt, ohne Kopie
+    try:
+        npages = len(doc)
+        for page in doc:
             try:
-                tables = page.extract_tables() or []
-            except Exception:
-                tables = []
-            for tbl in tables:
-                for row in tbl:
-                    if not row:
-                        continue
-                    line = " ".join([c for c in row if c]).strip()
-                    if line:
-                        text_lines.append(line)
-            # Fließtext
-            raw = page.extract_text() or ""
-            for ln in raw.splitlines():
-                ln = ln.strip()
-                if ln:
-                    text_lines.append(ln)
+                textpage = page.get_textpage()
+                try:
+                    lines.extend(_split_text_lines(textpage.get_text_bounded()))
+                finally:
+                    textpage.close()
+            finally:
+                page.close()
+    finally:
+        doc.close()
+    return lines, npages
+
+def _parse_single_page(pdf_bytes: bytes, page_index: int) -> list[str]:
+    """
+    Liest die Textzeilen einer einzelnen Seite. Öffnet das PDF selbst,
+    damit die Funktion in einem eigenen Prozess laufen kann.
+    """
+    with pdfplumber.open(io.BytesIO(pdf_bytes)) as doc:
+        return _split_text_lines(doc.pages[page_index].extract_text() or "")
+
+def _extract_lines_pdfplumber(pdf_bytes: bytes, npages: int | None) -> list[str]:
+    # Seiten parallel, falls mehrere; Seitenzahl kommt von PDFium (nur falls PDFium scheiterte, selbst zählen)
+    if npages is None:
+        with pdfplumber.open(io.BytesIO(pdf_bytes)) as doc:
+            npages = len(doc.pages)
+    if npages > 1:
+        page_lines = _PAGE_POOL.map(_parse_single_page, [pdf_bytes] * npages, range(npages))
+    else:
+        page_lines = [_parse_single_page(pdf_bytes, i) for i in range(npages)]
+    return [ln for lines in page_lines for ln in lines]
 
-    # 2) Normalisieren & Deko filtern
+def _normalize_lines(text_lines: list[str]) -> tuple[list[str], list[str]]:
+    """
+    Normalisiert die Zeilen und filtert Deko ("Menüplan …", "KW …").
+    Gibt die Zeilen und ihre kleingeschriebene Variante zurück (jede Zeile nur einmal lowern).
+    """
     norm_lines: list[str] = []
+    low_lines: list[str] = []
     for ln in text_lines:
-        ln = _squash_spaced_letters(ln)          # "M O N T A G" -> "MONTAG"
-        ln = re.sub(r"\s+", " ", ln).strip()
+        ln = _normalize_line(ln)                 # "M O N T A G" -> "MONTAG"
         if not ln:
             continue
         low = ln.lower()
         if low.startswith("menüplan") or "kw" in low:
             continue
         norm_lines.append(ln)
+        low_lines.append(low)
+    return norm_lines, low_lines
 
-    # 3) Versuch A: Wochentage im Gesamttest finden und stream segmentieren
-    blob = "\n".join(norm_lines).lower()
-    day_regexes = {wd: re.compile(p.pattern.replace("\\b", ""), re.IGNORECASE)
-                   for wd, p in WEEKDAY_PATTERNS.items()}  # großzügig: Wortgrenzen raus
-    hits = []
-    for wd in WEEKDAY_ORDER:
-        m = day_regexes[wd].search(blob)
-        if m:
-            hits.append((wd, m.start()))
+def _weekday_hits(blob: str, blob_low: str) -> list[tuple[str, int]]:
+    """
+    Positionen der Wochentage in `blob` (zum Schneiden der Segmente).
+    Gesucht wird in `blob_low`, solange dessen Offsets zu `blob` passen.
+    """
+    if len(blob_low) != len(blob):
+        # lower() hat Zeichen verlängert (z. B. "İ") – direkt im Original suchen (IGNORECASE)
+        return [(wd, m.start()) for wd in WEEKDAY_ORDER if (m := _DAY_RE_LOOSE[wd].search(blob))]
+    # Nach dem Squash meist feste Wörter – str.find zuerst, lockere Regex als Fallback
+    return [(wd, pos) for wd in WEEKDAY_ORDER if (pos := _find_weekday(blob_low, wd)) != -1]
+
+def parse_week_pdf(pdf: bytes | BinaryIO) -> dict[str, list[dict]]:
+    """
+    Gibt je Wochentag eine Liste von Gerichten zurück:
+      {'montag': [{'title': '...', 'price_chf': '...'}, ...], ...}
+    Akzeptiert rohe Bytes oder ein Datei-Objekt (z. B. io.BytesIO).
+    """
+    results = {wd: [] for wd in WEEKDAY_ORDER}
+
+    # 1) Alles an Textzeilen einsammeln: PDFium zuerst (liest den Puffer direkt)
+    try:
+        text_lines, npages = _extract_lines_pdfium(pdf)
+    except Exception:
+        text_lines, npages = [], None
+
+    # 2) Normalisieren & Deko filtern
+    norm_lines, low_lines = _normalize_lines(text_lines)
+
+    # 3) Versuch A: Wochentage im Gesamttext finden und stream segmentieren
+    blob = "\n".join(norm_lines)          # Segmente behalten Originalschreibweise
+    blob_low = "\n".join(low_lines)       # nur für die Suche
+    hits = _weekday_hits(blob, blob_low)
+    if not hits:
+        # PDFium lieferte keine Wochentage – pdfplumber als Fallback (braucht Bytes für die Worker)
+        if isinstance(pdf, bytes):
+            pdf_bytes = pdf
+        else:
+            pdf.seek(0)
+            pdf_bytes = pdf.read()
+        norm_lines, low_lines = _normalize_lines(_extract_lines_pdfplumber(pdf_bytes, npages))
+        blob = "\n".join(norm_lines)
+        blob_low = "\n".join(low_lines)
+        hits = _weekday_hits(blob, blob_low)
 
     segments_by_pos = None
     if len(hits) >= 2:
@@ -212,14 +368,14 @@ def parse_week_pdf(pdf_bytes: bytes) -> dict[str, list[dict]]:
         # Blob-Segment zurück in Zeilen und extrahieren
         for wd in WEEKDAY_ORDER:
             if wd in segments_by_pos:
-                seg_lines = [re.sub(r"\s+", " ", ln).strip()
-                             for ln in segments_by_pos[wd].splitlines() if ln.strip()]
+                seg_lines = [t for t in (" ".join(ln.split())
+                                         for ln in segments_by_pos[wd].splitlines()) if t]
                 results[wd] = _extract_items_from_lines(seg_lines)
 
     # 4) Versuch B (Fallback): Segmentierung über Marker „Tagessuppe klein“
     if not any(results.values()):
-        marker_idx = [i for i, ln in enumerate(norm_lines)
-                      if "tagessuppe" in ln.lower() and "klein" in ln.lower()]
+        marker_idx = [i for i, low in enumerate(low_lines)
+                      if "tagessuppe" in low and "klein" in low]
         if len(marker_idx) >= 5:
             blocks = []
             for i in range(5):
@@ -230,69 +386,74 @@ def parse_week_pdf(pdf_bytes: bytes) -> dict[str, list[dict]]:
                 results[wd] = _extract_items_from_lines(blocks[i])
 
     # 5) Dedup/Feinschliff
-    for wd in results:
-        seen = set()
-        dedup = []
-        for it in results[wd]:
-            key = (it["title"].lower(), it.get("price_chf"))
-            if key in seen:
-                continue
-            seen.add(key)
-            dedup.append(it)
-        results[wd] = dedup
+    for wd, items in results.items():
+        seen = {}  # dict behält Einfügereihenfolge – erster Treffer gewinnt
+        for it in items:
+            seen.setdefault((it["title"].casefold(), it.get("price_chf")), it)
+        results[wd] = list(seen.values())
 
     return results
 
 # --------- High-Level: Heute/Woche als DataFrame ---------
-def build_dataframe_for_today(week_data: dict[str, list[dict]], today: dt.date) -> pd.DataFrame:
+WEEK_COLUMNS = ["date", "weekday", "title", "price_chf", "source"]
+
+def build_week_dataframe(week_data: dict[str, list[dict]], today: dt.date, source: str) -> pd.DataFrame:
     dates = week_dates_for_today(today)
-    wd_key = weekday_de_name(today.weekday())
-    rows = []
-    if wd_key and wd_key in week_data:
-        for it in week_data[wd_key]:
-            rows.append({
-                "date": dates[wd_key].isoformat(),
-                "weekday": wd_key.capitalize(),
-                "title": it["title"],
-                "price_chf": it.get("price_chf"),
-                "source": get_cached_pdf_url() or ""
-            })
-    return pd.DataFrame(rows, columns=["date", "weekday", "title", "price_chf", "source"])
-
-def scrape_week() -> dict[str, list[dict]]:
-    pdf_bytes = load_week_pdf_bytes()
-    return parse_week_pdf(pdf_bytes)
+    # Tupel statt Dicts pro Gericht; Spalten sind fix vorgegeben
+    rows = [(dates[wd].isoformat(), wd.capitalize(), it["title"], it.get("price_chf"), source)
+            for wd in WEEKDAY_ORDER for it in week_data.get(wd, ())]
+    return pd.DataFrame.from_records(rows, columns=WEEK_COLUMNS)
+
+# --------- Cache (Woche) ---------
+# Das PDF ändert sich nur wöchentlich – geparste Woche pro Prozess zwischenspeichern
+_TTL = 3600  # Sekunden
+_CACHE = {"ts": 0.0, "iso_week": None, "week_df": None}
+_CACHE_LOCK = threading.Lock()
+
+def scrape_week_df() -> pd.DataFrame:
+    """
+    Liefert die geparste Woche als DataFrame aus dem Cache, solange dieser
+    jünger als _TTL ist und zur aktuellen Kalenderwoche gehört. Sonst PDF neu laden & parsen.
+    """
+    today = today_local_date()
+    iso_week = today.isocalendar()[:2]
+    with _CACHE_LOCK:  # verhindert parallele Downloads bei gleichzeitigen Requests
+        new_week = _CACHE["iso_week"] != iso_week  # auch beim ersten Laden nach dem Start
+        if (_CACHE["week_df"] is None
+                or new_week
+                or time.monotonic() - _CACHE["ts"] >= _TTL):
+            # Bei Wochenwechsel HTTP-Cache umgehen – sonst zeigt die Startseite evtl. noch aufs alte PDF
+            week = parse_week_pdf(load_week_pdf(refresh=new_week))
+            _CACHE.update(ts=time.monotonic(), iso_week=iso_week,
+                          week_df=build_week_dataframe(week, today, get_cached_pdf_url() or ""))
+        # Achtung: geteilt zwischen Requests – nur lesen/slicen, nicht verändern
+        return _CACHE["week_df"]
+
+def scrape_weekday_df(wd_key: str) -> pd.DataFrame:
+    df = scrape_week_df()
+    return df[df["weekday"] == wd_key.capitalize()]
 
 def scrape_today_df() -> pd.DataFrame:
-    week = scrape_week()
-    return build_dataframe_for_today(week, today_local_date())
+    wd_key = weekday_de_name(today_local_date().weekday())
+    if wd_key is None:
+        return scrape_week_df().iloc[0:0]
+    return scrape_weekday_df(wd_key)
 
 # --------- Flask Routes ---------
-@app.route("/")
-def index():
-    df = scrape_today_df()
-    # Optional: Am Wochenende die Freitagsdaten zeigen
-    if df.empty and today_local_date().weekday() >= 5:
-        # Freitag der aktuellen Woche
-        week = scrape_week()
-        dates = week_dates_for_today(today_local_date())
-        rows = []
-        for it in week.get("freitag", []):
-            rows.append({
-                "date": dates["freitag"].isoformat(),
-                "weekday": "Freitag",
-                "title": it["title"],
-                "price_chf": it.get("price_chf"),
-                "source": get_cached_pdf_url() or ""
-            })
-        df = pd.DataFrame(rows, columns=["date", "weekday", "title", "price_chf", "source"])
-
-    if df.empty:
-        table_html = "<p>Für heute wurde nichts gefunden (evtl. Wochenende oder PDF-Layout geändert).</p>"
-    else:
-        table_html = df.to_html(index=False, justify="left")
+def _csv_download(df: pd.DataFrame, filename: str):
+    # CSV direkt als UTF-8 in einen Byte-Puffer schreiben (ohne StringIO-Umweg)
+    buf = io.BytesIO()
+    df.to_csv(buf, index=False, encoding="utf-8")
+    buf.seek(0)
+    return send_file(
+        buf,
+        mimetype="text/csv; charset=utf-8",
+        as_attachment=True,
+        download_name=filename
+    )
 
-    return render_template_string("""
+# einmal kompiliert; Flask-Umgebung behält Autoescaping wie bei render_template_string
+_INDEX_TEMPLATE = app.jinja_env.from_string("""
     <!doctype html>
     <html lang="de">
     <head>
@@ -314,7 +475,23 @@ def index():
       <p><a href="/menu.json">JSON</a> · <a href="/save.csv">CSV (heute)</a> · <a href="/week.json">Woche JSON</a> · <a href="/week.csv">Woche CSV</a></p>
     </body>
     </html>
-    """, table=table_html, today=today_local_date().isoformat(), src=get_cached_pdf_url() or "–")
+    """)
+
+@app.route("/")
+def index():
+    df = scrape_today_df()
+    # Optional: Am Wochenende die Freitagsdaten zeigen
+    if df.empty and today_local_date().weekday() >= 5:
+        # Freitag der aktuellen Woche
+        df = scrape_weekday_df("freitag")
+
+    if df.empty:
+        table_html = "<p>Für heute wurde nichts gefunden (evtl. Wochenende oder PDF-Layout geändert).</p>"
+    else:
+        table_html = df.to_html(index=False, justify="left")
+
+    return _INDEX_TEMPLATE.render(table=table_html, today=today_local_date().isoformat(),
+                                  src=get_cached_pdf_url() or "–")
 
 @app.route("/menu.json")
 def menu_json():
@@ -326,58 +503,19 @@ def download_csv_today():
     df = scrape_today_df()
     if df.empty:
         return Response("Keine Daten gefunden.", status=404)
-    buf = io.StringIO()
-    df.to_csv(buf, index=False)
-    buf.seek(0)
-    return send_file(
-        io.BytesIO(buf.getvalue().encode("utf-8")),
-        mimetype="text/csv; charset=utf-8",
-        as_attachment=True,
-        download_name=f"unisg_menu_{today_local_date().isoformat()}.csv"
-    )
+    return _csv_download(df, f"unisg_menu_{today_local_date().isoformat()}.csv")
 
 @app.route("/week.json")
 def week_json():
-    week = scrape_week()
-    dates = week_dates_for_today(today_local_date())
-    records = []
-    for wd in WEEKDAY_ORDER:
-        for it in week.get(wd, []):
-            records.append({
-                "date": dates[wd].isoformat(),
-                "weekday": wd.capitalize(),
-                "title": it["title"],
-                "price_chf": it.get("price_chf"),
-                "source": get_cached_pdf_url() or ""
-            })
-    return jsonify(records)
+    df = scrape_week_df()
+    return jsonify(df.to_dict(orient="records"))
 
 @app.route("/week.csv")
 def week_csv():
-    week = scrape_week()
-    dates = week_dates_for_today(today_local_date())
-    rows = []
-    for wd in WEEKDAY_ORDER:
-        for it in week.get(wd, []):
-            rows.append({
-                "date": dates[wd].isoformat(),
-                "weekday": wd.capitalize(),
-                "title": it["title"],
-                "price_chf": it.get("price_chf"),
-                "source": get_cached_pdf_url() or ""
-            })
-    df = pd.DataFrame(rows, columns=["date", "weekday", "title", "price_chf", "source"])
+    df = scrape_week_df()
     if df.empty:
         return Response("Keine Daten gefunden.", status=404)
-    buf = io.StringIO()
-    df.to_csv(buf, index=False)
-    buf.seek(0)
-    return send_file(
-        io.BytesIO(buf.getvalue().encode("utf-8")),
-        mimetype="text/csv; charset=utf-8",
-        as_attachment=True,
-        download_name=f"unisg_menu_week_{today_local_date().isoformat()}.csv"
-    )
+    return _csv_download(df, f"unisg_menu_week_{today_local_date().isoformat()}.csv")
 
 if __name__ == "__main__":
     # Lokal starten: python app.py
@@ -0,0 +1,111 @@
+import pandas as pd
+from flask import render_template_string
+from flask.json.tag import TaggedJSONSerializer
+
+import app as mensa_app
+from app import _extract_items_from_lines, _find_weekday, _normalize_line, _weekday_hits
+
+
+def test_normalize_line_squashes_spaced_header():
+    assert _normalize_line("M O N T A G") == "MONTAG"
+    assert _normalize_line("  M  O  N  T  A  G ") == "MONTAG"
+    assert _normalize_line("D\tI E N S T A G  Menü") == "DIENSTAG Menü"
+
+
+def test_normalize_line_keeps_regular_words():
+    assert _normalize_line("Suppe a b") == "Suppe a b"
+    assert _normalize_line("Rösti A, G") == "Rösti A, G"
+    # bekannte Grenze: jede Folge von mind. 3 Einzelbuchstaben wird zusammengezogen
+    assert _normalize_line("Menü A B C") == "Menü ABC"
+
+
+def test_find_weekday_falls_back_to_loose_pattern():
+    assert _find_weekday("menü\nmontag suppe", "montag") == 5
+    assert _find_weekday("m ontag suppe", "montag") == 0
+    assert _find_weekday("suppe", "montag") == -1
+
+
+def test_weekday_hits_offsets_match_original_when_lower_changes_length():
+    blob = "İ Menü\nMontag Suppe\nDienstag Pasta"
+    assert len(blob.lower()) != len(blob)
+    hits = dict(_weekday_hits(blob, blob.lower()))
+    assert blob[hits["montag"]:].startswith("Montag")
+    assert blob[hits["dienstag"]:].startswith("Dienstag")
+
+
+def test_week_json_via_test_client(monkeypatch):
+    df = pd.DataFrame.from_records(
+        [("2024-01-08", "Montag", "Pasta", "9.50", "https://example.org/menu.pdf")],
+        columns=mensa_app.WEEK_COLUMNS,
+    )
+    monkeypatch.setattr(mensa_app, "scrape_week_df", lambda: df)
+
+    resp = mensa_app.app.test_client().get("/week.json")
+
+    assert resp.status_code == 200
+    assert resp.mimetype == "application/json"
+    assert resp.get_json() == [{
+        "date": "2024-01-08", "price_chf": "9.50", "source": "https://example.org/menu.pdf",
+        "title": "Pasta", "weekday": "Montag",
+    }]
+    assert resp.data.startswith(b'[{"date":')  # Keys sortiert wie bei Flasks Default
+
+
+def test_flask_json_helpers_work_with_orjson_provider():
+    with mensa_app.app.test_request_context():
+        assert render_template_string("{{ d|tojson }}", d={"b": 1, "a": "ä"}) == '{"a":"ä","b":1}'
+        # Session-Serializer übergibt separators=…
+        assert TaggedJSONSerializer().dumps({"x": 1}) == '{"x":1}'
+
+
+def test_extract_items_several_prices_per_line():
+    items = _extract_items_from_lines(["Tagessuppe klein CHF 3.50 Tagessuppe gross CHF 5,00"])
+    assert items == [
+        {"title": "Tagessuppe klein", "price_chf": "3.50"},
+        {"title": "Tagessuppe gross", "price_chf": "5.00"},
+    ]
+
+
+def test_extract_items_alternative_price_stays_with_item():
+    items = _extract_items_from_lines(["Pasta CHF 8.50 / 9.50 Salat CHF 6.00"])
+    assert items == [
+        {"title": "Pasta", "price_chf": "8.50"},
+        {"title": "Salat", "price_chf": "6.00"},
+    ]
+
+
+def test_extract_items_drops_trailing_unpriced_remainder():
+    items = _extract_items_from_lines(["Pasta CHF 8.50", "Dessert nach Wahl"])
+    assert items == [{"title": "Pasta", "price_chf": "8.50"}]
+
+
+def test_extract_items_without_chf_falls_back_to_lines():
+    items = _extract_items_from_lines(["  Pasta  al Pesto ", "", "Salat,"])
+    assert items == [
+        {"title": "Pasta al Pesto", "price_chf": None},
+        {"title": "Salat", "price_chf": None},
+    ]
+
+
+def test_extract_items_stops_at_max_items():
+    items = _extract_items_from_lines(["A CHF 1.00 B CHF 2.00 C CHF 3.00 D CHF 4.00 E CHF 5.00"])
+    assert [it["title"] for it in items] == ["A", "B", "C", "D"]
+
+
+def test_parse_week_pdf_keeps_original_case(monkeypatch):
+    # Titel behalten die Schreibweise aus dem PDF (Allergencodes entfernt),
+    # der Wochentags-Header steht – zusammengezogen – vor dem ersten Gericht
+    lines = [
+        "Menüplan KW 2",
+        "M O N T A G",
+        "Rindsgulasch A, G CHF 12.50",
+        "Dienstag",
+        "Pasta Bolognese CHF 11.00",
+    ]
+    monkeypatch.setattr(mensa_app, "_extract_lines_pdfium", lambda pdf: (lines, 1))
+
+    week = mensa_app.parse_week_pdf(b"")
+
+    assert week["montag"] == [{"title": "MONTAG Rindsgulasch", "price_chf": "12.50"}]
+    assert week["dienstag"] == [{"title": "Dienstag Pasta Bolognese", "price_chf": "11.00"}]
+    assert week["mittwoch"] == []